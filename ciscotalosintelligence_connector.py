@@ -289,12 +289,11 @@ class TalosIntelligenceConnector(BaseConnector):
 
         payload = {"urls": {"endpoint": [ip_request]}, "app_info": self._appinfo}
 
-        ret_val = self._query_reputation(action_result, payload, ip)
+        ret_val, threat_level = self._query_reputation(action_result, payload, ip, param.get("output_mode", OUTPUT_MODE_FULL))
         if phantom.is_fail(ret_val):
             return action_result.get_status()
 
         summary = action_result.update_summary({})
-        threat_level = action_result.get_data()[0]["Threat_Level"]
         summary["message"] = f"{ip} has a {threat_level} threat level"
         return action_result.set_status(phantom.APP_SUCCESS)
 
@@ -321,12 +320,11 @@ class TalosIntelligenceConnector(BaseConnector):
         payload = {"urls": [], "app_info": self._appinfo}
         payload["urls"].append(url_entry)
 
-        ret_val = self._query_reputation(action_result, payload, domain)
+        ret_val, threat_level = self._query_reputation(action_result, payload, domain, param.get("output_mode", OUTPUT_MODE_FULL))
         if phantom.is_fail(ret_val):
             return action_result.get_status()
 
         summary = action_result.update_summary({})
-        threat_level = action_result.get_data()[0]["Threat_Level"]
         summary["message"] = f"{domain} has a {threat_level} threat level"
         return action_result.set_status(phantom.APP_SUCCESS)
 
@@ -353,68 +351,153 @@ class TalosIntelligenceConnector(BaseConnector):
         payload = {"urls": [], "app_info": self._appinfo}
         payload["urls"].append(url_entry)
 
-        ret_val = self._query_reputation(action_result, payload, url)
+        ret_val, threat_level = self._query_reputation(action_result, payload, url, param.get("output_mode", OUTPUT_MODE_FULL))
         if phantom.is_fail(ret_val):
             return action_result.get_status()
 
         summary = action_result.update_summary({})
-        threat_level = action_result.get_data()[0]["Threat_Level"]
         summary["message"] = f"{url} has a {threat_level} threat level"
         return action_result.set_status(phantom.APP_SUCCESS)
 
-    def _query_reputation(self, action_result, payload, observable=None):
+    def _query_reputation(self, action_result, payload, observable=None, output_mode=OUTPUT_MODE_FULL):
+        if output_mode not in OUTPUT_MODES:
+            return RetVal(
+                action_result.set_status(
+                    phantom.APP_ERROR,
+                    f"Invalid output mode '{output_mode}'. Valid values are: {', '.join(OUTPUT_MODES)}",
+                ),
+                None,
+            )
+
         taxonomy_ret_val, taxonomy = self._fetch_taxonomy(action_result)
 
         if phantom.is_fail(taxonomy_ret_val):
-            return action_result.get_status()
+            return RetVal(action_result.get_status(), None)
         # make rest call
         ret_val, response = self._make_rest_call_helper(ENDPOINT_QUERY_REPUTATION_V3, action_result, method="post", json=payload)
         if phantom.is_fail(ret_val):
-            return action_result.get_status()
+            return RetVal(action_result.get_status(), None)
 
         response_taxonomy_map_version = response["taxonomy_map_version"]
         if response_taxonomy_map_version > self._state["taxonomy_version"]:
             taxonomy_ret_val, taxonomy = self._fetch_taxonomy(action_result, allow_cache=False)
+            if phantom.is_fail(taxonomy_ret_val):
+                return RetVal(action_result.get_status(), None)
 
         if phantom.is_fail(ret_val) or "results" not in response:
-            return action_result.get_status()
+            return RetVal(action_result.get_status(), None)
+
+        if not response["results"]:
+            return RetVal(action_result.set_status(phantom.APP_ERROR, f"No reputation results returned for {observable}"), None)
 
-        threat_level = ""
-        threat_categories = {}
-        aup_categories = {}
+        summary_threat_level = None
 
         for result in response["results"]:
-            for url_result in result["results"]:
-                for tag in url_result["context_tags"]:
-                    tax_id = str(tag["taxonomy_id"])
-                    entry_id = str(tag["taxonomy_entry_id"])
+            threat_level = None
+            threat_categories = []
+            aup_categories = []
+
+            for category, tax_id, entry_id in self._iter_context_tags(result, taxonomy):
+                if category == TAXONOMY_THREAT_LEVELS:
+                    threat_level = (tax_id, entry_id)
+                elif category == TAXONOMY_THREAT_CATEGORIES and (tax_id, entry_id) not in threat_categories:
+                    threat_categories.append((tax_id, entry_id))
+                elif category == TAXONOMY_AUP_CATEGORIES and (tax_id, entry_id) not in aup_categories:
+                    aup_categories.append((tax_id, entry_id))
+
+            threat_level_name = self._get_taxonomy_entry_name(taxonomy, *threat_level) if threat_level else ""
+            if summary_threat_level is None:
+                summary_threat_level = threat_level_name
 
-                    if tax_id not in taxonomy["taxonomies"]:
-                        continue
+            output = {}
+            output["Observable"] = observable
+            if output_mode == OUTPUT_MODE_COMPACT:
+                output["Threat_Level_ID"] = int(threat_level[1]) if threat_level else None
+                output["Threat_Category_IDs"] = [int(entry_id) for _, entry_id in threat_categories]
+                output["AUP_IDs"] = [int(entry_id) for _, entry_id in aup_categories]
+                output["Taxonomy_Version"] = self._state["taxonomy_version"]
+            else:
+                output["Threat_Level"] = threat_level_name
+                # dedupe by name so entries sharing a display name are listed once
+                output["Threat_Categories"] = ", ".join(
+                    dict.fromkeys(self._get_taxonomy_entry_name(taxonomy, *entry) for entry in threat_categories)
+                )
+                output["AUP"] = ", ".join(dict.fromkeys(self._get_taxonomy_entry_name(taxonomy, *entry) for entry in aup_categories))
 
-                    if not taxonomy["taxonomies"][tax_id]["is_avail"]:
-                        continue
+            action_result.add_data(output)
 
-                    category = taxonomy["taxonomies"][tax_id]["name"]["en-us"]["text"]
-                    name = taxonomy["taxonomies"][tax_id]["entries"][entry_id]["name"]["en-us"]["text"]
-                    description = taxonomy["taxonomies"][tax_id]["entries"][entry_id]["description"]["en-us"]["text"]
+        return RetVal(phantom.APP_SUCCESS, summary_threat_level)
 
-                    if category == "Threat Levels":
-                        threat_level = name
-                    elif category == "Threat Categories":
-                        threat_categories[name] = description
-                    elif category == "Acceptable Use Policy Categories":
-                        aup_categories[name] = description
+    def _iter_context_tags(self, result, taxonomy):
+        # Yields (category, taxonomy id, entry id) for every tag that resolves against the cached taxonomy,
+        # tags from unavailable taxonomies or with entries missing from this taxonomy version are dropped
+        for url_result in result["results"]:
+            for tag in url_result["context_tags"]:
+                tax_id = str(tag["taxonomy_id"])
+                entry_id = str(tag["taxonomy_entry_id"])
 
-            output = {}
-            output["Observable"] = observable
-            output["Threat_Level"] = threat_level
-            output["Threat_Categories"] = ", ".join(list(threat_categories.keys()))
-            output["AUP"] = ", ".join(list(aup_categories.keys()))
+                if tax_id not in taxonomy["taxonomies"]:
+                    continue
 
-            action_result.add_data(output)
+                if not taxonomy["taxonomies"][tax_id]["is_avail"]:
+                    continue
+
+                if entry_id not in taxonomy["taxonomies"][tax_id]["entries"]:
+                    self.debug_print(f"Skipping entry {entry_id} of taxonomy {tax_id}, not found in the cached taxonomy")
+                    continue
+
+                category = taxonomy["taxonomies"][tax_id]["name"]["en-us"]["text"]
+
+                yield category, tax_id, entry_id
 
-            return phantom.APP_SUCCESS
+    def _get_taxonomy_entry_name(self, taxonomy, tax_id, entry_id):
+        return taxonomy["taxonomies"][tax_id]["entries"][entry_id]["name"]["en-us"]["text"]
+
+    def _handle_lookup_taxonomy(self, param):
+        self.save_progress(f"In action handler for: {self.get_action_identifier()}")
+        action_result = self.add_action_result(ActionResult(dict(param)))
+
+        category = param.get("category")
+        if category and category not in TAXONOMY_CATEGORIES:
+            return action_result.set_status(
+                phantom.APP_ERROR,
+                f"Invalid category '{category}'. Valid values are: {', '.join(TAXONOMY_CATEGORIES)}",
+            )
+
+        try:
+            entry_ids = {str(int(entry_id.strip())) for entry_id in param.get("entry_ids", "").split(",") if entry_id.strip()}
+        except ValueError:
+            return action_result.set_status(phantom.APP_ERROR, "Please provide entry IDs as a comma-separated list of integers")
+
+        ret_val, taxonomy = self._fetch_taxonomy(action_result)
+        if phantom.is_fail(ret_val):
+            return action_result.get_status()
+
+        for tax_id, tax in taxonomy["taxonomies"].items():
+            if not tax["is_avail"]:
+                continue
+
+            tax_category = tax["name"]["en-us"]["text"]
+            if tax_category not in TAXONOMY_CATEGORIES or (category and tax_category != category):
+                continue
+
+            for entry_id, entry in tax["entries"].items():
+                if entry_ids and entry_id not in entry_ids:
+                    continue
+
+                output = {}
+                output["Category"] = tax_category
+                output["Taxonomy_ID"] = int(tax_id)
+                output["Entry_ID"] = int(entry_id)
+                output["Name"] = entry["name"]["en-us"]["text"]
+                output["Description"] = entry["description"]["en-us"]["text"]
+
+                action_result.add_data(output)
+
+        summary = action_result.update_summary({})
+        summary["taxonomy_version"] = self._state["taxonomy_version"]
+        summary["total_entries"] = action_result.get_data_size()
+        return action_result.set_status(phantom.APP_SUCCESS)
 
     def _fetch_taxonomy(self, action_result, allow_cache=True):
         payload = {"app_info": self._appinfo}
@@ -425,7 +508,7 @@ class TalosIntelligenceConnector(BaseConnector):
         ret_val, response = self._make_rest_call_helper(ENDPOINT_QUERY_TAXONOMIES, action_result, method="post", json=payload)
         self.debug_print("fetching taxonomy")
         if phantom.is_fail(ret_val):
-            return action_result.get_status()
+            return RetVal(action_result.get_status(), None)
 
         taxonomy = response["catalogs"][str(self._catalog_id)]
 
@@ -449,6 +532,9 @@ class TalosIntelligenceConnector(BaseConnector):
         if action_id == "url_reputation":
             ret_val = self._handle_url_reputation(param)
 
+        if action_id == "lookup_taxonomy":
+            ret_val = self._handle_lookup_taxonomy(param)
+
         if action_id == "test_connectivity":
             ret_val = self._handle_test_connectivity(param)
 
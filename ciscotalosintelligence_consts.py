@@ -22,3 +22,11 @@ ENDPOINT_QUERY_TAXONOMIES = "/Talos.Service.TTS/QueryTaxonomyCatalogs"
 MAX_CONNECTION_RETIRIES = 10
 MAX_REQUEST_RETRIES = 2
 MAX_REQUEST_TIMEOUT = 5
+
+OUTPUT_MODE_FULL = "full"
+OUTPUT_MODE_COMPACT = "compact"
+OUTPUT_MODES = [OUTPUT_MODE_FULL, OUTPUT_MODE_COMPACT]
+TAXONOMY_THREAT_LEVELS = "Threat Levels"
+TAXONOMY_THREAT_CATEGORIES = "Threat Categories"
+TAXONOMY_AUP_CATEGORIES = "Acceptable Use Policy Categories"
+TAXONOMY_CATEGORIES = [TAXONOMY_THREAT_LEVELS, TAXONOMY_THREAT_CATEGORIES, TAXONOMY_AUP_CATEGORIES]
@@ -0,0 +1,351 @@
+# File: test_ciscotalosintelligence_connector.py
+#
+# Copyright (c) 2025 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+#
+#
+
+import copy
+import importlib.util
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+
+class FakeActionResult:
+    def __init__(self, param=None):
+        self._param = param or {}
+        self._data = []
+        self._summary = {}
+        self._status = True
+        self._message = ""
+
+    def add_data(self, data):
+        self._data.append(data)
+
+    def get_data(self):
+        return self._data
+
+    def get_data_size(self):
+        return len(self._data)
+
+    def update_summary(self, summary):
+        self._summary.update(summary)
+        return self._summary
+
+    def get_summary(self):
+        return self._summary
+
+    def set_status(self, status, message=""):
+        self._status = status
+        self._message = message
+        return status
+
+    def get_status(self):
+        return self._status
+
+    def get_message(self):
+        return self._message
+
+
+class FakeBaseConnector:
+    def __init__(self):
+        self.action_results = []
+        self.action_identifier = None
+
+    def add_action_result(self, action_result):
+        self.action_results.append(action_result)
+        return action_result
+
+    def get_action_identifier(self):
+        return self.action_identifier
+
+    def debug_print(self, *args, **kwargs):
+        pass
+
+    def save_progress(self, *args, **kwargs):
+        pass
+
+
+def _stub_module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def _stub_missing_dependencies():
+    # The SOAR platform modules and the packaged wheels are only available on a SOAR instance
+    if importlib.util.find_spec("phantom") is None:
+        _stub_module("phantom")
+        _stub_module("phantom.app", APP_SUCCESS=True, APP_ERROR=False, is_fail=lambda ret_val: not ret_val)
+        _stub_module("phantom.action_result", ActionResult=FakeActionResult)
+        _stub_module("phantom.base_connector", BaseConnector=FakeBaseConnector)
+    if importlib.util.find_spec("phantom_common") is None:
+        _stub_module("phantom_common")
+        _stub_module("phantom_common.install_info", is_dev_env=lambda: False)
+    for name in ("httpx", "requests"):
+        if importlib.util.find_spec(name) is None:
+            _stub_module(name)
+    if importlib.util.find_spec("bs4") is None:
+        _stub_module("bs4", BeautifulSoup=None)
+    if importlib.util.find_spec("cryptography") is None:
+        _stub_module("cryptography", x509=None)
+        _stub_module("cryptography.hazmat")
+        _stub_module("cryptography.hazmat.backends", default_backend=None)
+
+
+_stub_missing_dependencies()
+
+import phantom.app as phantom
+
+from ciscotalosintelligence_connector import TalosIntelligenceConnector
+
+
+def _entry(name):
+    return {"name": {"en-us": {"text": name}}, "description": {"en-us": {"text": f"{name} description"}}}
+
+
+TAXONOMY = {
+    "taxonomies": {
+        "1": {
+            "is_avail": True,
+            "name": {"en-us": {"text": "Threat Levels"}},
+            "entries": {"10": _entry("Untrusted"), "11": _entry("Favorable")},
+        },
+        "2": {
+            "is_avail": True,
+            "name": {"en-us": {"text": "Threat Categories"}},
+            "entries": {"64": _entry("Malware Sites"), "65": _entry("Phishing")},
+        },
+        "3": {
+            "is_avail": True,
+            "name": {"en-us": {"text": "Acceptable Use Policy Categories"}},
+            "entries": {"100": _entry("Gambling")},
+        },
+        "4": {
+            "is_avail": False,
+            "name": {"en-us": {"text": "Threat Categories"}},
+            "entries": {"7": _entry("Unavailable")},
+        },
+    }
+}
+
+
+def _tag(tax_id, entry_id):
+    return {"taxonomy_id": tax_id, "taxonomy_entry_id": entry_id}
+
+
+def _response(*tags, version=5):
+    return {"taxonomy_map_version": version, "results": [{"results": [{"context_tags": list(tags)}]}]}
+
+
+def _failed_rest_call(endpoint, action_result, **kwargs):
+    return action_result.set_status(phantom.APP_ERROR, "Error Connecting to server"), None
+
+
+class TestQueryReputation(unittest.TestCase):
+    def setUp(self):
+        self.connector = TalosIntelligenceConnector()
+        self.connector._state = {"taxonomy": TAXONOMY, "taxonomy_version": 5}
+        self.connector._appinfo = {}
+        self.action_result = FakeActionResult()
+
+    def _query(self, response, output_mode):
+        with mock.patch.object(self.connector, "_make_rest_call_helper", return_value=(phantom.APP_SUCCESS, response)):
+            return self.connector._query_reputation(self.action_result, {}, "example.com", output_mode)
+
+    def test_compact_returns_ids(self):
+        response = _response(_tag(1, 10), _tag(2, 64), _tag(2, 65), _tag(2, 64), _tag(3, 100), _tag(3, 100))
+
+        ret_val, threat_level = self._query(response, "compact")
+
+        self.assertTrue(ret_val)
+        self.assertEqual(threat_level, "Untrusted")
+        self.assertEqual(
+            self.action_result.get_data(),
+            [
+                {
+                    "Observable": "example.com",
+                    "Threat_Level_ID": 10,
+                    "Threat_Category_IDs": [64, 65],
+                    "AUP_IDs": [100],
+                    "Taxonomy_Version": 5,
+                }
+            ],
+        )
+
+    def test_compact_without_threat_level(self):
+        ret_val, threat_level = self._query(_response(_tag(2, 65)), "compact")
+
+        self.assertTrue(ret_val)
+        self.assertEqual(threat_level, "")
+        self.assertIsNone(self.action_result.get_data()[0]["Threat_Level_ID"])
+        self.assertEqual(self.action_result.get_data()[0]["Threat_Category_IDs"], [65])
+
+    def test_compact_omits_unknown_and_unavailable_entries(self):
+        response = _response(_tag(2, 999), _tag(4, 7), _tag(9, 1), _tag(3, 100))
+
+        ret_val, _ = self._query(response, "compact")
+
+        self.assertTrue(ret_val)
+        row = self.action_result.get_data()[0]
+        self.assertEqual(row["Threat_Category_IDs"], [])
+        self.assertEqual(row["AUP_IDs"], [100])
+
+    def test_full_returns_names(self):
+        response = _response(_tag(1, 11), _tag(2, 64), _tag(2, 65), _tag(3, 100))
+
+        ret_val, threat_level = self._query(response, "full")
+
+        self.assertTrue(ret_val)
+        self.assertEqual(threat_level, "Favorable")
+        self.assertEqual(
+            self.action_result.get_data(),
+            [
+                {
+                    "Observable": "example.com",
+                    "Threat_Level": "Favorable",
+                    "Threat_Categories": "Malware Sites, Phishing",
+                    "AUP": "Gambling",
+                }
+            ],
+        )
+
+    def test_full_dedupes_categories_by_name(self):
+        taxonomy = copy.deepcopy(TAXONOMY)
+        taxonomy["taxonomies"]["2"]["entries"]["66"] = _entry("Phishing")
+        self.connector._state["taxonomy"] = taxonomy
+
+        ret_val, _ = self._query(_response(_tag(2, 65), _tag(2, 66)), "full")
+
+        self.assertTrue(ret_val)
+        self.assertEqual(self.action_result.get_data()[0]["Threat_Categories"], "Phishing")
+
+    def test_empty_results(self):
+        ret_val, threat_level = self._query({"taxonomy_map_version": 5, "results": []}, "compact")
+
+        self.assertFalse(ret_val)
+        self.assertIsNone(threat_level)
+        self.assertEqual(self.action_result.get_data(), [])
+        self.assertIn("No reputation results returned for example.com", self.action_result.get_message())
+
+    def test_refreshes_newer_taxonomy(self):
+        taxonomy = copy.deepcopy(TAXONOMY)
+        taxonomy["taxonomies"]["2"]["entries"]["67"] = _entry("Spam")
+        responses = [
+            (phantom.APP_SUCCESS, _response(_tag(2, 67), version=6)),
+            (phantom.APP_SUCCESS, {"catalogs": {"2": taxonomy}, "version": 6}),
+        ]
+
+        with mock.patch.object(self.connector, "_make_rest_call_helper", side_effect=responses):
+            ret_val, _ = self.connector._query_reputation(self.action_result, {}, "example.com", "compact")
+
+        self.assertTrue(ret_val)
+        self.assertEqual(self.connector._state["taxonomy_version"], 6)
+        self.assertEqual(self.action_result.get_data()[0]["Threat_Category_IDs"], [67])
+        self.assertEqual(self.action_result.get_data()[0]["Taxonomy_Version"], 6)
+
+    def test_refresh_failure(self):
+        responses = iter([(phantom.APP_SUCCESS, _response(_tag(2, 64), version=6))])
+
+        def rest_call(endpoint, action_result, **kwargs):
+            return next(responses, None) or _failed_rest_call(endpoint, action_result, **kwargs)
+
+        with mock.patch.object(self.connector, "_make_rest_call_helper", side_effect=rest_call):
+            ret_val, threat_level = self.connector._query_reputation(self.action_result, {}, "example.com", "compact")
+
+        self.assertFalse(ret_val)
+        self.assertIsNone(threat_level)
+        self.assertEqual(self.action_result.get_data(), [])
+        self.assertEqual(self.connector._state["taxonomy_version"], 5)
+
+    def test_invalid_output_mode(self):
+        with mock.patch.object(self.connector, "_make_rest_call_helper") as rest_call:
+            ret_val, threat_level = self.connector._query_reputation(self.action_result, {}, "example.com", "verbose")
+
+        self.assertFalse(ret_val)
+        self.assertIsNone(threat_level)
+        self.assertIn("Invalid output mode 'verbose'", self.action_result.get_message())
+        rest_call.assert_not_called()
+
+
+class TestDomainReputation(unittest.TestCase):
+    def setUp(self):
+        self.connector = TalosIntelligenceConnector()
+        self.connector._state = {"taxonomy": TAXONOMY, "taxonomy_version": 5}
+        self.connector._appinfo = {}
+
+    def _handle(self, response):
+        with mock.patch.object(self.connector, "_make_rest_call_helper", return_value=(phantom.APP_SUCCESS, response)):
+            ret_val = self.connector._handle_domain_reputation({"domain": "example.com", "output_mode": "compact"})
+        return ret_val, self.connector.action_results[0]
+
+    def test_compact_summary_resolves_threat_level(self):
+        ret_val, action_result = self._handle(_response(_tag(1, 10), _tag(2, 64)))
+
+        self.assertTrue(ret_val)
+        self.assertEqual(action_result.get_summary(), {"message": "example.com has a Untrusted threat level"})
+        self.assertEqual(action_result.get_data()[0]["Threat_Level_ID"], 10)
+        self.assertEqual(action_result.get_data()[0]["Threat_Category_IDs"], [64])
+
+    def test_empty_results(self):
+        ret_val, action_result = self._handle({"taxonomy_map_version": 5, "results": []})
+
+        self.assertFalse(ret_val)
+        self.assertEqual(action_result.get_summary(), {})
+
+
+class TestLookupTaxonomy(unittest.TestCase):
+    def setUp(self):
+        self.connector = TalosIntelligenceConnector()
+        self.connector._state = {"taxonomy": TAXONOMY, "taxonomy_version": 5}
+        self.connector._appinfo = {}
+
+    def test_lookup_by_category_and_ids(self):
+        ret_val = self.connector._handle_lookup_taxonomy({"category": "Threat Categories", "entry_ids": "65, 7"})
+
+        action_result = self.connector.action_results[0]
+        self.assertTrue(ret_val)
+        self.assertEqual(
+            action_result.get_data(),
+            [{"Category": "Threat Categories", "Taxonomy_ID": 2, "Entry_ID": 65, "Name": "Phishing", "Description": "Phishing description"}],
+        )
+        self.assertEqual(action_result.get_summary(), {"taxonomy_version": 5, "total_entries": 1})
+
+    def test_lookup_invalid_entry_ids(self):
+        ret_val = self.connector._handle_lookup_taxonomy({"entry_ids": "64, phishing"})
+
+        self.assertFalse(ret_val)
+        self.assertEqual(self.connector.action_results[0].get_data(), [])
+
+    def test_lookup_taxonomy_fetch_failure(self):
+        self.connector._state = {}
+
+        with mock.patch.object(self.connector, "_make_rest_call_helper", side_effect=_failed_rest_call):
+            ret_val = self.connector._handle_lookup_taxonomy({})
+
+        action_result = self.connector.action_results[0]
+        self.assertFalse(ret_val)
+        self.assertEqual(action_result.get_message(), "Error Connecting to server")
+        self.assertEqual(action_result.get_data(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()